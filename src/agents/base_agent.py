@@ -87,6 +87,21 @@ class BaseAgent(ABC):
             # 如果遇到编码错误，使用 ASCII 替换不可打印字符
             print(log_message.encode('ascii', 'replace').decode('ascii'), flush=True)
     
+    def log_cache_usage(self, response: Any):
+        """
+        记录 LLM 响应的前缀缓存命中情况（服务端返回 usage 信息时）
+        
+        Args:
+            response: LLM 响应（AIMessage）
+        """
+        usage = getattr(response, 'usage_metadata', None)
+        if not isinstance(usage, dict):
+            return
+        
+        cached = (usage.get('input_token_details') or {}).get('cache_read')
+        if cached:
+            self.log(f"前缀缓存命中: {cached}/{usage.get('input_tokens', '?')} 输入 tokens")
+    
     def add_to_memory(self, item: Dict[str, Any]):
         """
         添加到记忆
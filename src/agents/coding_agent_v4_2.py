@@ -8,6 +8,7 @@ Coding Agent V4.2 - 融合终端和文件操作能力
 4. [V4.1功能] - 保留 V4.1 的所有核心功能（错误检测、文件路径注入等）
 """
 
+import os
 import json
 import re
 import pandas as pd
@@ -20,6 +21,10 @@ from src.tools.repl import PythonREPL
 from src.tools.os_tools import OSTools
 
 
+# 工具日志分隔线（每个日志块合并为一次 log 调用，减少逐行输出）
+RULE = "=" * 60
+THIN_RULE = "-" * 60
+
 # 错误类型映射与修复提示
 ERROR_FIX_PROMPTS = {
     "SyntaxError": "检测到语法错误，请修正代码语法，确保所有括号/引号闭合，缩进正确",
@@ -51,6 +56,10 @@ class CodingAgentV4_2(BaseAgent):
         
         # 核心组件
         self.repl = PythonREPL()  # 有状态的 Python 环境
+        
+        # 可选：后台预热重型库，与首次 LLM 调用重叠（CODING_PREWARM_IMPORTS=1 开启）
+        if os.getenv("CODING_PREWARM_IMPORTS") == "1":
+            PythonREPL.warmup()
         self.raw_llm = llm_client.get_llm() if hasattr(llm_client, 'get_llm') else llm_client
         
         # 错误历史（用于检测重复错误）
@@ -131,22 +140,16 @@ class CodingAgentV4_2(BaseAgent):
             Returns:
                 执行结果或错误信息
             """
-            self.log("=" * 60)
-            self.log("🐍 [Python REPL] 执行代码")
-            self.log("=" * 60)
-            
             # 打印代码内容
             code_preview = code[:300] + "\n..." if len(code) > 300 else code
-            self.log(f"代码:\n{code_preview}")
-            self.log("-" * 60)
+            self.log(f"{RULE}\n🐍 [Python REPL] 执行代码\n{RULE}\n代码:\n{code_preview}\n{THIN_RULE}")
             
             try:
                 output = self.repl.run(code)
                 
                 # 打印执行结果
                 output_preview = output[:500] + "\n..." if len(output) > 500 else output
-                self.log(f"输出:\n{output_preview}")
-                self.log("=" * 60)
+                self.log(f"输出:\n{output_preview}\n{RULE}")
                 
                 # 检查是否有错误
                 if "Error" in output or "Traceback" in output:
@@ -200,18 +203,13 @@ class CodingAgentV4_2(BaseAgent):
             Returns:
                 命令输出
             """
-            self.log("=" * 60)
-            self.log(f"💻 [Shell] 执行命令")
-            self.log("=" * 60)
-            self.log(f"命令: {command}")
-            self.log("-" * 60)
+            self.log(f"{RULE}\n💻 [Shell] 执行命令\n{RULE}\n命令: {command}\n{THIN_RULE}")
             
             output = OSTools.execute_bash(command)
             
             # 打印完整输出（限制长度）
             output_preview = output[:500] + "\n..." if len(output) > 500 else output
-            self.log(f"输出:\n{output_preview}")
-            self.log("=" * 60)
+            self.log(f"输出:\n{output_preview}\n{RULE}")
             
             return output
         
@@ -227,9 +225,7 @@ class CodingAgentV4_2(BaseAgent):
             Returns:
                 文件内容
             """
-            self.log("=" * 60)
-            self.log(f"📖 [文件读取] {filepath}")
-            self.log("=" * 60)
+            self.log(f"{RULE}\n📖 [文件读取] {filepath}\n{RULE}")
             
             try:
                 with open(filepath, 'r', encoding='utf-8') as f:
@@ -239,18 +235,14 @@ class CodingAgentV4_2(BaseAgent):
                         content = f.read()
                 
                 content_preview = content[:300] + "\n..." if len(content) > 300 else content
-                self.log(f"内容 (前300字符):\n{content_preview}")
-                self.log(f"✅ [OK] 读取成功，总长度: {len(content)} 字符")
-                self.log("=" * 60)
+                self.log(f"内容 (前300字符):\n{content_preview}\n✅ [OK] 读取成功，总长度: {len(content)} 字符\n{RULE}")
                 return content
             
             except FileNotFoundError:
-                self.log(f"❌ [ERROR] 文件不存在: {filepath}")
-                self.log("=" * 60)
+                self.log(f"❌ [ERROR] 文件不存在: {filepath}\n{RULE}")
                 return f"❌ [ERROR] 文件不存在: {filepath}"
             except Exception as e:
-                self.log(f"❌ [ERROR] 读取失败: {e}")
-                self.log("=" * 60)
+                self.log(f"❌ [ERROR] 读取失败: {e}\n{RULE}")
                 return f"❌ [ERROR] 读取失败: {e}"
         
         @tool
@@ -265,9 +257,7 @@ class CodingAgentV4_2(BaseAgent):
             Returns:
                 操作结果
             """
-            self.log("=" * 60)
-            self.log(f"✍️ [文件写入] {filepath}")
-            self.log("=" * 60)
+            self.log(f"{RULE}\n✍️ [文件写入] {filepath}\n{RULE}")
             
             try:
                 # 确保目录存在
@@ -276,13 +266,11 @@ class CodingAgentV4_2(BaseAgent):
                 with open(filepath, 'w', encoding='utf-8') as f:
                     f.write(content)
                 
-                self.log(f"✅ [OK] 写入成功，长度: {len(content)} 字符")
-                self.log("=" * 60)
+                self.log(f"✅ [OK] 写入成功，长度: {len(content)} 字符\n{RULE}")
                 return f"✅ [OK] 文件已保存: {filepath}"
             
             except Exception as e:
-                self.log(f"❌ [ERROR] 写入失败: {e}")
-                self.log("=" * 60)
+                self.log(f"❌ [ERROR] 写入失败: {e}\n{RULE}")
                 return f"❌ [ERROR] 写入失败: {e}"
         
         @tool
@@ -4,10 +4,76 @@ Methodologist Agent - 方法论智能体
 """
 
 import json
-from typing import Dict, Any
+from concurrent.futures import ThreadPoolExecutor
+from typing import Dict, Any, List
 from src.agents.base_agent import BaseAgent
 
 
+# 执行规格生成的静态提示词（所有步骤共享，作为请求的公共前缀）
+SPEC_PROMPT_PREFIX = """你是精通数据科学和软件工程的"配方师"（Methodologist）。
+你的任务是将研究方案转化为详细的技术执行规格。
+
+**你的任务:**
+1. 解析 implementation_config 中的所有参数
+2. 理解 input_data_source（数据来源）和 output_files（输出文件）
+3. 将 notes 中的自然语言描述转化为具体的代码逻辑
+4. 定义清晰的函数签名和数据流
+5. **特别注意步骤间的文件依赖关系**
+6. 指定输入输出格式
+
+**关于新的数据流模式:**
+- input_data_source.main_data: 主数据文件路径
+- input_data_source.main_data_columns: 需要使用的主数据列
+- input_data_source.dependencies: 需要加载的前置步骤文件
+- output_files.results_csv: 保存新列的文件路径
+- output_files.model_pkl: 保存模型的文件路径
+
+**输出格式 (严格 JSON):**
+{
+  "step_id": "与输入步骤的 step_id 相同（整数）",
+  "function_name": "建议的主函数名称（如 detect_technology_gaps）",
+  "function_signature": "完整的函数签名（如 def detect_technology_gaps(df: pd.DataFrame) -> Dict[str, Any]）",
+  "description": "函数功能描述",
+  "required_libraries": ["库1", "库2", "库3"],
+  "library_versions": {
+    "库1": "版本号或latest",
+    "库2": "版本号或latest"
+  },
+  "input_specification": {
+    "data_structure": "输入数据结构（如 DataFrame）",
+    "required_columns": ["列1", "列2"],
+    "load_dependencies": ["需要加载的文件路径"],
+    "sample_data_description": "如何生成合成数据的描述"
+  },
+  "processing_steps": [
+    {
+      "step_number": 1,
+      "description": "步骤描述",
+      "code_logic": "伪代码或关键代码片段",
+      "key_parameters": {"参数名": "参数值"}
+    }
+  ],
+  "output_specification": {
+    "data_structure": "输出数据结构（dict）",
+    "expected_format": "预期格式描述",
+    "return_keys": ["key1", "key2"],
+    "save_to_files": {
+      "results_csv": "保存新列的文件路径",
+      "model_pkl": "保存模型的文件路径（如果有）"
+    }
+  },
+  "error_handling": ["需要处理的异常类型1", "异常类型2"],
+  "validation_criteria": ["验证标准1", "验证标准2"],
+  "performance_notes": "性能考虑和优化建议"
+}"""
+
+# 生成阶段必须存在的字段（缺失仅告警）
+CORE_SPEC_FIELDS = frozenset(['function_name', 'required_libraries', 'processing_steps'])
+
+# 校验阶段必须存在的字段（缺失即判定不完整）
+REQUIRED_SPEC_FIELDS = CORE_SPEC_FIELDS | {'input_specification', 'output_specification'}
+
+
 class MethodologistAgent(BaseAgent):
     """
     方法论智能体（配方师）
@@ -62,33 +128,99 @@ class MethodologistAgent(BaseAgent):
             'execution_spec': execution_spec
         }
     
-    def process_multiple(self, steps: list) -> list:
+    def process_multiple(self, steps: list, max_workers: int = 8) -> list:
         """
         处理多个步骤，确保步骤间数据流一致
         
+        按 depends_on 分波次执行：同一波次内互不依赖的步骤并发生成规格，
+        依赖步骤在其前置步骤完成后再处理，并接收前置步骤的输出规格。
+        未声明 depends_on 的步骤沿用串行语义，依赖前一步。
+        
         Args:
             steps: 步骤列表
+            max_workers: 同一波次内的最大并发数
             
         Returns:
-            执行规格列表
+            执行规格列表（与 steps 顺序一致）
         """
-        specs = []
+        specs: List[Any] = [None] * len(steps)
+        dependencies = self._resolve_dependencies(steps)
+        pending = list(range(len(steps)))
+        prefix_warmed = False
         
-        for i, step in enumerate(steps, 1):
-            self.log(f"处理步骤 {i}/{len(steps)}: {step.get('objective', 'N/A')}")
+        while pending:
+            ready = [i for i in pending if all(specs[d] is not None for d in dependencies[i])]
+            if not ready:
+                # 依赖无法满足（如循环依赖），退化为按顺序处理
+                ready = [pending[0]]
             
-            # 传递前一步的输出规格（如果存在）
-            previous_output = specs[-1].get('output_specification') if specs else None
+            def run(i):
+                step = steps[i]
+                self.log(f"处理步骤 {i + 1}/{len(steps)}: {step.get('objective', 'N/A')}")
+                
+                # 传递最后一个前置步骤的输出规格（如果存在）
+                dep_specs = [specs[d] for d in dependencies[i] if specs[d] is not None]
+                previous_output = dep_specs[-1].get('output_specification') if dep_specs else None
+                
+                return self.process({
+                    'step': step,
+                    'previous_output': previous_output,
+                    'step_index': i + 1
+                })['execution_spec']
             
-            result = self.process({
-                'step': step,
-                'previous_output': previous_output,
-                'step_index': i
-            })
-            specs.append(result['execution_spec'])
+            if len(ready) == 1:
+                specs[ready[0]] = run(ready[0])
+            else:
+                # 并发请求前先写入共享前缀缓存，否则同一波次的请求会各自完整预填充
+                if not prefix_warmed:
+                    self.warmup_prefix()
+                with ThreadPoolExecutor(max_workers=min(max_workers, len(ready))) as executor:
+                    for i, spec in zip(ready, executor.map(run, ready)):
+                        specs[i] = spec
+            
+            # 任何请求都已发送过相同的前缀，后续波次无需再预热
+            prefix_warmed = True
+            
+            pending = [i for i in pending if i not in ready]
         
         return specs
     
+    def warmup_prefix(self):
+        """
+        预热执行规格提示词的共享前缀
+        
+        发送一次只包含 SPEC_PROMPT_PREFIX 的请求（max_tokens=1），让服务端建立前缀缓存，
+        之后各步骤的请求只需预填充各自的动态部分。预热失败不影响后续流程。
+        """
+        try:
+            response = self.llm.invoke(SPEC_PROMPT_PREFIX, max_tokens=1)
+            self.log_cache_usage(response)
+        except Exception as e:
+            self.log(f"前缀预热失败（已忽略）: {e}", "warning")
+    
+    @staticmethod
+    def _resolve_dependencies(steps: list) -> List[List[int]]:
+        """
+        将每个步骤的 depends_on（step_id 列表）解析为步骤下标列表
+        
+        未声明 depends_on 的步骤视为依赖前一步；未知的 step_id 会被忽略。
+        depends_on 来自 LLM 输出，单个值（如 1 或 "2"）按单元素列表处理。
+        """
+        index_by_id = {str(step.get('step_id', i + 1)): i for i, step in enumerate(steps)}
+        
+        dependencies = []
+        for i, step in enumerate(steps):
+            if 'depends_on' in step:
+                raw_deps = step.get('depends_on')
+                if not isinstance(raw_deps, (list, tuple)):
+                    raw_deps = [] if raw_deps is None else [raw_deps]
+                deps = [index_by_id[str(d)] for d in raw_deps if str(d) in index_by_id]
+                dependencies.append([d for d in deps if d != i])
+            else:
+                dependencies.append([i - 1] if i > 0 else [])
+        
+        return dependencies
+    
     def _generate_execution_spec(self, step: Dict[str, Any]) -> Dict[str, Any]:
         """生成详细的执行规格"""
         previous_output = step.get('previous_output')
@@ -113,71 +245,19 @@ class MethodologistAgent(BaseAgent):
 5. 函数应该能处理参数为 None 的情况（在测试时可能没有前置结果）
 """
         
-        prompt = f"""你是精通数据科学和软件工程的"配方师"（Methodologist）。
-你的任务是将研究方案转化为详细的技术执行规格。
+        # 静态前缀在前、动态内容在后，使各步骤的请求共享同一前缀（命中服务端前缀缓存）
+        prompt = f"""{SPEC_PROMPT_PREFIX}
 
 **输入的研究步骤:**
 {json.dumps(actual_step, indent=2, ensure_ascii=False)}
 {dependency_note}
-
-**你的任务:**
-1. 解析 implementation_config 中的所有参数
-2. 理解 input_data_source（数据来源）和 output_files（输出文件）
-3. 将 notes 中的自然语言描述转化为具体的代码逻辑
-4. 定义清晰的函数签名和数据流
-5. **特别注意步骤间的文件依赖关系**
-6. 指定输入输出格式
-
-**关于新的数据流模式:**
-- input_data_source.main_data: 主数据文件路径
-- input_data_source.main_data_columns: 需要使用的主数据列
-- input_data_source.dependencies: 需要加载的前置步骤文件
-- output_files.results_csv: 保存新列的文件路径
-- output_files.model_pkl: 保存模型的文件路径
-
-**输出格式 (严格 JSON):**
-{{
-  "step_id": {actual_step.get('step_id')},
-  "function_name": "建议的主函数名称（如 detect_technology_gaps）",
-  "function_signature": "完整的函数签名（如 def detect_technology_gaps(df: pd.DataFrame) -> Dict[str, Any]）",
-  "description": "函数功能描述",
-  "required_libraries": ["库1", "库2", "库3"],
-  "library_versions": {{
-    "库1": "版本号或latest",
-    "库2": "版本号或latest"
-  }},
-  "input_specification": {{
-    "data_structure": "输入数据结构（如 DataFrame）",
-    "required_columns": ["列1", "列2"],
-    "load_dependencies": ["需要加载的文件路径"],
-    "sample_data_description": "如何生成合成数据的描述"
-  }},
-  "processing_steps": [
-    {{
-      "step_number": 1,
-      "description": "步骤描述",
-      "code_logic": "伪代码或关键代码片段",
-      "key_parameters": {{"参数名": "参数值"}}
-    }}
-  ],
-  "output_specification": {{
-    "data_structure": "输出数据结构（dict）",
-    "expected_format": "预期格式描述",
-    "return_keys": ["key1", "key2"],
-    "save_to_files": {{
-      "results_csv": "保存新列的文件路径",
-      "model_pkl": "保存模型的文件路径（如果有）"
-    }}
-  }},
-  "error_handling": ["需要处理的异常类型1", "异常类型2"],
-  "validation_criteria": ["验证标准1", "验证标准2"],
-  "performance_notes": "性能考虑和优化建议"
-}}
+输出 JSON 中的 step_id 必须为 {json.dumps(actual_step.get('step_id'))}。
 
 请直接输出 JSON，不要包含任何其他文字。"""
 
         try:
             response = self.llm.invoke(prompt)
+            self.log_cache_usage(response)
             
             # 处理 AIMessage 对象
             if hasattr(response, 'content'):
@@ -196,10 +276,8 @@ class MethodologistAgent(BaseAgent):
             execution_spec = json.loads(content)
             
             # 验证必要字段
-            required_fields = ['function_name', 'required_libraries', 'processing_steps']
-            for field in required_fields:
-                if field not in execution_spec:
-                    self.log(f"警告: 缺少必要字段 {field}", "warning")
+            for field in sorted(CORE_SPEC_FIELDS - execution_spec.keys()):
+                self.log(f"警告: 缺少必要字段 {field}", "warning")
             
             return execution_spec
             
@@ -227,17 +305,8 @@ class MethodologistAgent(BaseAgent):
         Returns:
             验证结果 {"valid": bool, "issues": []}
         """
-        issues = []
-        
         # 检查必要字段
-        required_fields = [
-            'function_name', 'required_libraries', 'processing_steps',
-            'input_specification', 'output_specification'
-        ]
-        
-        for field in required_fields:
-            if field not in spec:
-                issues.append(f"缺少必要字段: {field}")
+        issues = [f"缺少必要字段: {field}" for field in sorted(REQUIRED_SPEC_FIELDS - spec.keys())]
         
         # 检查函数名格式
         if 'function_name' in spec:
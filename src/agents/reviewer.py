@@ -211,24 +211,27 @@ class ReviewerAgent(BaseAgent):
         3. 结果是否回答了用户问题
         """
         # 统计执行情况
+        # 单次遍历：同时统计成功步骤并收集问题
         total_steps = len(code_metadata)
-        successful_steps = sum(1 for meta in code_metadata if meta.get('is_valid', False))
+        successful_steps = 0
+        issues = []
+        for i, meta in enumerate(code_metadata, 1):
+            if meta.get('is_valid', False):
+                successful_steps += 1
+            else:
+                issues.append(f"步骤 {i}: {', '.join(meta.get('issues', ['未知错误']))}")
         failed_steps = total_steps - successful_steps
         
         # 计算成功率
         success_rate = (successful_steps / total_steps * 100) if total_steps > 0 else 0
         
-        # 收集问题
-        issues = []
-        for i, meta in enumerate(code_metadata, 1):
-            if not meta.get('is_valid', False):
-                issues.append(f"步骤 {i}: {', '.join(meta.get('issues', ['未知错误']))}")
-        
         # 判断是否通过
         passed = success_rate >= 80  # 80% 以上算通过
         
         # 使用 LLM 进行语义验证
-        semantic_check = self._semantic_verification(user_goal, blueprint, code_metadata)
+        semantic_check = self._semantic_verification(
+            user_goal, blueprint, code_metadata, successful_steps
+        )
         
         return {
             'passed': passed and semantic_check['relevant'],
@@ -244,11 +247,15 @@ class ReviewerAgent(BaseAgent):
         self,
         user_goal: str,
         blueprint: Dict,
-        code_metadata: List[Dict]
+        code_metadata: List[Dict],
+        successful_steps: int = None
     ) -> Dict[str, Any]:
         """
         语义验证：使用 LLM 判断结果是否回答了用户问题
         """
+        if successful_steps is None:
+            successful_steps = sum(1 for m in code_metadata if m.get('is_valid', False))
+        
         prompt = f"""你是专利分析领域的专家。请判断以下分析结果是否回答了用户的问题。
 
 **用户问题:**
@@ -259,7 +266,7 @@ class ReviewerAgent(BaseAgent):
 分析步骤: {len(blueprint.get('analysis_logic_chains', []))} 个
 
 **执行情况:**
-成功步骤: {sum(1 for m in code_metadata if m.get('is_valid', False))}/{len(code_metadata)}
+成功步骤: {successful_steps}/{len(code_metadata)}
 
 **判断要求:**
 1. 分析方案是否针对用户问题
@@ -340,7 +347,7 @@ class ReviewerAgent(BaseAgent):
 
 **执行情况:**
 - 总步骤数: {len(code_metadata)}
-- 成功步骤: {sum(1 for m in code_metadata if m.get('is_valid', False))}
+- 成功步骤: {verification.get('successful_steps', 0)}
 - 验证状态: {'通过' if verification.get('passed') else '部分通过'}
 
 **报告要求:**
@@ -10,6 +10,115 @@ from typing import Dict, Any, List
 from src.agents.base_agent import BaseAgent
 
 
+# 蓝图生成的静态提示词（设计要求 + 输出格式），作为每次请求的公共前缀
+BLUEPRINT_PROMPT_PREFIX = """你是专利分析领域的资深研究员。请根据用户的研究目标，设计一个**创新且有针对性**的分析方案。
+
+**设计要求:**
+1. 将研究目标分解为 2-4 个**独立可运行的 Python 脚本**。
+2. **鼓励创新**：根据用户目标选择最合适的方法，不要局限于常见方法。可以考虑：
+   - 文本分析：LDA、NMF、BERTopic、Word2Vec、TF-IDF
+   - 聚类：KMeans、DBSCAN、层次聚类、谱聚类
+   - 异常检测：ABOD、Isolation Forest、LOF、One-Class SVM
+   - 网络分析：共现网络、引用网络、技术演化路径
+   - 时间序列：趋势分析、突变检测、周期性分析
+   - 其他创新方法
+3. 每个脚本是完全独立的，明确：
+   - **输入数据源**: 
+     * 主数据：从 Excel 文件加载（列名必须使用【当前数据可用列名】）
+     * 前置依赖：如果需要前一步的结果，从文件加载（如 `step_1_results.csv` 或 `step_1_model.pkl`）
+   - **输出文件**: 
+     * 新列数据：保存为 CSV（如 `step_1_results.csv`，包含新生成的列）
+     * 模型文件：保存为 PKL（如 `step_1_lda_model.pkl`，使用 joblib）
+   - **方法**: 具体算法名称
+4. 步骤关系：
+   - 串行：Step 2 需要加载 Step 1 保存的文件。
+   - 并行：独立运行，不依赖其他步骤。
+
+**重要提示：**
+- **严禁幻觉列名**：输入列名必须严格匹配【当前数据可用列名】中提供的列表。
+- **理解列的含义**：
+  * `公开(公告)号` 是专利编号（如 "CN123456A"），不是日期
+  * `授权日` 是日期列，用于时间序列分析
+  * 不要混淆这两列的用途
+- **输出格式要求**：
+  * 数值型结果：直接保存数值（int, float）
+  * 分类结果：保存类别标签（str, int）
+  * 时间序列结果：保存数值统计（如变化点数量、趋势值），不要保存 Timestamp 对象或列表
+- **不要复制示例**：下面的示例仅供参考格式，列名必须使用实际提供的列名。
+- **文件路径固定**：主数据路径固定为 `data/clean_patents1_with_topics_filled.xlsx`，sheet 名为 `clear`。
+- **文件传递思维**：
+  - 步骤 1 保存 `outputs/step_1_results.csv`（包含新生成的列）
+  - 步骤 2 加载 `outputs/step_1_results.csv`，使用新生成的列
+  - 步骤 1 保存 `outputs/step_1_model.pkl`（如果有模型）
+  - 步骤 2 加载 `outputs/step_1_model.pkl` 使用模型
+- **参数粒度**：只需提供关键参数建议（如 n_topics: 5），具体参数由后续 Agent 填充。
+- 避免抽象概念（❌"构建知识图谱"），使用具体操作（✅"LDA主题分类"）。
+- 每个脚本可以直接运行：`python step_1.py`
+
+**输出格式（严格 JSON）:**
+下面是**格式示例**（仅供参考结构，请根据用户目标创新设计）：
+
+{
+  "research_objective": "研究目标的简洁描述",
+  "expected_outcomes": ["预期成果1", "预期成果2"],
+  "analysis_logic_chains": [
+    {
+      "step_id": 1,
+      "objective": "第一步的分析目标（根据用户需求设计）",
+      "method": "选择合适的方法（参考上面的方法列表）",
+      "implementation_config": {
+        "algorithm": "具体算法名称",
+        "input_data_source": {
+          "main_data": "data/clean_patents1_with_topics_filled.xlsx",
+          "main_data_columns": ["从可用列名中选择需要的列"],
+          "dependencies": []
+        },
+        "output_files": {
+          "results_csv": "outputs/step_1_results.csv",
+          "results_columns": ["result_col1", "result_col2"],
+          "column_types": {"result_col1": "数据类型", "result_col2": "数据类型"},
+          "format_notes": "只保存 ID 列（序号、公开(公告)号）和新生成的列",
+          "model_pkl": "outputs/step_1_model.pkl",
+          "model_objects": ["model_name"]
+        },
+        "parameters": {"param1": "value1"}
+      },
+      "notes": "步骤说明",
+      "depends_on": []
+    },
+    {
+      "step_id": 2,
+      "objective": "第二步的分析目标（可以依赖步骤1）",
+      "method": "选择合适的方法",
+      "implementation_config": {
+        "algorithm": "具体算法名称",
+        "input_data_source": {
+          "main_data": "data/clean_patents1_with_topics_filled.xlsx",
+          "main_data_columns": [],
+          "dependencies": [
+            {
+              "file": "outputs/step_1_results.csv",
+              "columns": ["result_col1", "result_col2"],
+              "description": "步骤1生成的结果"
+            }
+          ]
+        },
+        "output_files": {
+          "results_csv": "outputs/step_2_results.csv",
+          "results_columns": ["new_col1"],
+          "format_notes": "只保存 ID 列和新生成的列",
+          "model_pkl": null,
+          "model_objects": []
+        },
+        "parameters": {"param1": "value1"}
+      },
+      "notes": "步骤说明",
+      "depends_on": [1]
+    }
+  ]
+}"""
+
+
 class StrategistAgent(BaseAgent):
     """
     战略智能体（大脑）
@@ -147,7 +256,12 @@ class StrategistAgent(BaseAgent):
         
         all_cases = []
         
+        # 同一次检索内去重关键词（查询不区分大小写），避免重复访问数据库
+        unique_keywords = {}
         for keyword in keywords:
+            unique_keywords.setdefault(str(keyword).lower(), keyword)
+        
+        for keyword in unique_keywords.values():
             try:
                 # 使用完整逻辑链检索
                 cases = self.neo4j.retrieve_best_practices(keyword, limit=2)
@@ -194,7 +308,8 @@ class StrategistAgent(BaseAgent):
         if available_columns:
             columns_info = str(available_columns)
         
-        prompt = f"""你是专利分析领域的资深研究员。请根据用户的研究目标，设计一个**创新且有针对性**的分析方案。
+        # 静态前缀在前、动态内容在后，使重复调用共享同一前缀（命中服务端前缀缓存）
+        prompt = f"""{BLUEPRINT_PROMPT_PREFIX}
 
 **用户研究目标:**
 {user_goal}
@@ -205,117 +320,13 @@ class StrategistAgent(BaseAgent):
 **相关案例参考:**
 {graph_context if graph_context else "（无相关案例，请基于你的专业知识设计）"}
 
-**设计要求:**
-1. 将研究目标分解为 2-4 个**独立可运行的 Python 脚本**。
-2. **鼓励创新**：根据用户目标选择最合适的方法，不要局限于常见方法。可以考虑：
-   - 文本分析：LDA、NMF、BERTopic、Word2Vec、TF-IDF
-   - 聚类：KMeans、DBSCAN、层次聚类、谱聚类
-   - 异常检测：ABOD、Isolation Forest、LOF、One-Class SVM
-   - 网络分析：共现网络、引用网络、技术演化路径
-   - 时间序列：趋势分析、突变检测、周期性分析
-   - 其他创新方法
-3. 每个脚本是完全独立的，明确：
-   - **输入数据源**: 
-     * 主数据：从 Excel 文件加载（列名必须使用【当前数据可用列名】）
-     * 前置依赖：如果需要前一步的结果，从文件加载（如 `step_1_results.csv` 或 `step_1_model.pkl`）
-   - **输出文件**: 
-     * 新列数据：保存为 CSV（如 `step_1_results.csv`，包含新生成的列）
-     * 模型文件：保存为 PKL（如 `step_1_lda_model.pkl`，使用 joblib）
-   - **方法**: 具体算法名称
-4. 步骤关系：
-   - 串行：Step 2 需要加载 Step 1 保存的文件。
-   - 并行：独立运行，不依赖其他步骤。
-
-**重要提示：**
-- **严禁幻觉列名**：输入列名必须严格匹配【当前数据可用列名】中提供的列表。
-- **理解列的含义**：
-  * `公开(公告)号` 是专利编号（如 "CN123456A"），不是日期
-  * `授权日` 是日期列，用于时间序列分析
-  * 不要混淆这两列的用途
-- **输出格式要求**：
-  * 数值型结果：直接保存数值（int, float）
-  * 分类结果：保存类别标签（str, int）
-  * 时间序列结果：保存数值统计（如变化点数量、趋势值），不要保存 Timestamp 对象或列表
-- **不要复制示例**：下面的示例仅供参考格式，列名必须使用实际提供的列名。
-- **文件路径固定**：主数据路径固定为 `data/clean_patents1_with_topics_filled.xlsx`，sheet 名为 `clear`。
-- **文件传递思维**：
-  - 步骤 1 保存 `outputs/step_1_results.csv`（包含新生成的列）
-  - 步骤 2 加载 `outputs/step_1_results.csv`，使用新生成的列
-  - 步骤 1 保存 `outputs/step_1_model.pkl`（如果有模型）
-  - 步骤 2 加载 `outputs/step_1_model.pkl` 使用模型
-- **参数粒度**：只需提供关键参数建议（如 n_topics: 5），具体参数由后续 Agent 填充。
-- 避免抽象概念（❌"构建知识图谱"），使用具体操作（✅"LDA主题分类"）。
-- 每个脚本可以直接运行：`python step_1.py`
-
 {"**注意**: 这是第二次生成，请提高方案的详细程度和可执行性。" if retry else ""}
 
-**输出格式（严格 JSON）:**
-下面是**格式示例**（仅供参考结构，请根据用户目标创新设计）：
-
-{{
-  "research_objective": "研究目标的简洁描述",
-  "expected_outcomes": ["预期成果1", "预期成果2"],
-  "analysis_logic_chains": [
-    {{
-      "step_id": 1,
-      "objective": "第一步的分析目标（根据用户需求设计）",
-      "method": "选择合适的方法（参考上面的方法列表）",
-      "implementation_config": {{
-        "algorithm": "具体算法名称",
-        "input_data_source": {{
-          "main_data": "data/clean_patents1_with_topics_filled.xlsx",
-          "main_data_columns": ["从可用列名中选择需要的列"],
-          "dependencies": []
-        }},
-        "output_files": {{
-          "results_csv": "outputs/step_1_results.csv",
-          "results_columns": ["result_col1", "result_col2"],
-          "column_types": {{"result_col1": "数据类型", "result_col2": "数据类型"}},
-          "format_notes": "只保存 ID 列（序号、公开(公告)号）和新生成的列",
-          "model_pkl": "outputs/step_1_model.pkl",
-          "model_objects": ["model_name"]
-        }},
-        "parameters": {{"param1": "value1"}}
-      }},
-      "notes": "步骤说明",
-      "depends_on": []
-    }},
-    {{
-      "step_id": 2,
-      "objective": "第二步的分析目标（可以依赖步骤1）",
-      "method": "选择合适的方法",
-      "implementation_config": {{
-        "algorithm": "具体算法名称",
-        "input_data_source": {{
-          "main_data": "data/clean_patents1_with_topics_filled.xlsx",
-          "main_data_columns": [],
-          "dependencies": [
-            {{
-              "file": "outputs/step_1_results.csv",
-              "columns": ["result_col1", "result_col2"],
-              "description": "步骤1生成的结果"
-            }}
-          ]
-        }},
-        "output_files": {{
-          "results_csv": "outputs/step_2_results.csv",
-          "results_columns": ["new_col1"],
-          "format_notes": "只保存 ID 列和新生成的列",
-          "model_pkl": null,
-          "model_objects": []
-        }},
-        "parameters": {{"param1": "value1"}}
-      }},
-      "notes": "步骤说明",
-      "depends_on": [1]
-    }}
-  ]
-}}
-
 只输出 JSON，不要其他文字。"""
 
         try:
             response = self.llm.invoke(prompt)
+            self.log_cache_usage(response)
             content = response.content if hasattr(response, 'content') else str(response)
             
             # 清理响应
@@ -3,12 +3,77 @@
 使用 LangGraph 编排三个 Agent 的协作
 """
 
-from typing import Dict, Any
+import os
+from pathlib import Path
+from types import SimpleNamespace
+from typing import Dict, Any, List
 from langgraph.graph import StateGraph, END
 from src.core.state import WorkflowState
+from src.utils.json_utils import dump_json
 import pandas as pd
 
 
+def _resolve_steps(steps: List[Dict[str, Any]]) -> List[SimpleNamespace]:
+    """
+    一次性解析蓝图步骤的 ID 与文件路径，供执行与校验阶段共享
+    
+    Args:
+        steps: 蓝图中的 analysis_logic_chains
+        
+    Returns:
+        与 steps 一一对应的列表，每项包含 step_id / result_file / code_file
+    """
+    resolved = []
+    for i, step in enumerate(steps, 1):
+        step_id = step.get('step_id', i)
+        output_files = (step.get('implementation_config') or {}).get('output_files') or {}
+        results_csv = output_files.get('results_csv') if isinstance(output_files, dict) else None
+        resolved.append(SimpleNamespace(
+            step_id=step_id,
+            result_file=results_csv if _is_under_outputs(results_csv) else f"outputs/step_{step_id}_results.csv",
+            code_file=f"outputs/step_{step_id}.py"
+        ))
+    return resolved
+
+
+def _is_under_outputs(path: Any) -> bool:
+    """
+    判断 LLM 给出的结果路径是否位于 outputs/ 目录下
+    
+    结果文件在执行前会被清理，因此只接受 outputs/ 内的路径，避免误删其他文件。
+    """
+    if not isinstance(path, str) or not path:
+        return False
+    return Path(path).resolve().is_relative_to(Path('outputs').resolve())
+
+
+def _remove_stale_results(result_files: List[str]):
+    """
+    批量清理旧结果文件，避免误判为本次执行的输出
+    
+    按目录分组，每个目录只做一次 scandir，而不是对每个文件分别 exists()/unlink()。
+    
+    Args:
+        result_files: 本次将要生成的结果文件路径
+    """
+    names_by_dir: Dict[Path, set] = {}
+    for result_file in result_files:
+        path = Path(result_file)
+        names_by_dir.setdefault(path.parent, set()).add(path.name)
+    
+    for directory, names in names_by_dir.items():
+        if not directory.is_dir():
+            continue
+        with os.scandir(directory) as it:
+            stale = [entry.path for entry in it if entry.name in names]
+        for stale_file in stale:
+            try:
+                os.unlink(stale_file)
+                print(f"  🗑️ 已删除旧结果文件: {stale_file}")
+            except Exception as e:
+                print(f"  ⚠️ 无法删除旧文件: {e}")
+
+
 def build_full_workflow(strategist, methodologist, coding_agent, reviewer=None):
     """
     构建完整的四 Agent 协作工作流
@@ -28,11 +93,8 @@ def build_full_workflow(strategist, methodologist, coding_agent, reviewer=None):
         result = strategist.process({'user_goal': state['user_goal']})
         
         # 立即保存蓝图到文件（方便调试）
-        import json
-        from pathlib import Path
         Path('outputs').mkdir(exist_ok=True)
-        with open('outputs/blueprint.json', 'w', encoding='utf-8') as f:
-            json.dump(result['blueprint'], f, ensure_ascii=False, indent=2)
+        dump_json(result['blueprint'], 'outputs/blueprint.json')
         print("  💾 蓝图已保存: outputs/blueprint.json")
         
         return {
@@ -49,11 +111,8 @@ def build_full_workflow(strategist, methodologist, coding_agent, reviewer=None):
         execution_specs = methodologist.process_multiple(steps)
         
         # 立即保存执行规格到文件（方便调试）
-        import json
-        from pathlib import Path
         Path('outputs').mkdir(exist_ok=True)
-        with open('outputs/execution_specs.json', 'w', encoding='utf-8') as f:
-            json.dump(execution_specs, f, ensure_ascii=False, indent=2)
+        dump_json(execution_specs, 'outputs/execution_specs.json')
         print("  💾 执行规格已保存: outputs/execution_specs.json")
         
         return {'execution_specs': execution_specs}
@@ -89,7 +148,16 @@ def build_full_workflow(strategist, methodologist, coding_agent, reviewer=None):
             '__builtins__': __builtins__
         }
         
-        for i, (spec, step) in enumerate(zip(execution_specs, steps), 1):
+        resolved_steps = _resolve_steps(steps)
+        
+        # 执行前一次性清理所有待执行步骤的旧结果文件
+        _remove_stale_results([
+            resolved.result_file
+            for spec, resolved in zip(execution_specs, resolved_steps)
+            if 'error' not in spec
+        ])
+        
+        for i, (spec, step, resolved) in enumerate(zip(execution_specs, steps, resolved_steps), 1):
             if 'error' in spec:
                 generated_codes.append('')
                 code_metadata.append({'error': spec['error']})
@@ -101,16 +169,6 @@ def build_full_workflow(strategist, methodologist, coding_agent, reviewer=None):
             
             print(f"[执行] 步骤 {i}: {spec.get('function_name', 'unknown')}")
             
-            # 清理该步骤的旧结果文件，避免误判
-            step_id = step.get('step_id', i)
-            old_result_file = Path(f"outputs/step_{step_id}_results.csv")
-            if old_result_file.exists():
-                try:
-                    old_result_file.unlink()
-                    print(f"  🗑️ 已删除旧结果文件: {old_result_file}")
-                except Exception as e:
-                    print(f"  ⚠️ 无法删除旧文件: {e}")
-            
             # 🔥 执行即迭代：最多尝试 3 次
             max_iterations = 3
             final_code = None
@@ -139,8 +197,7 @@ def build_full_workflow(strategist, methodologist, coding_agent, reviewer=None):
                 
                 # 保存生成的代码到文件
                 if code:
-                    step_id = step.get('step_id', i)
-                    code_file = f"outputs/step_{step_id}.py"
+                    code_file = resolved.code_file
                     with open(code_file, 'w', encoding='utf-8') as f:
                         f.write(code)
                     print(f"  💾 代码已保存: {code_file}")
@@ -166,8 +223,7 @@ def build_full_workflow(strategist, methodologist, coding_agent, reviewer=None):
                 
                 try:
                     # 读取生成的结果文件，获取列信息
-                    step_id = step.get('step_id', i)
-                    result_file = f"outputs/step_{step_id}_results.csv"
+                    result_file = resolved.result_file
                     
                     result_info = {'success': True}
                     if Path(result_file).exists():
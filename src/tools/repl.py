@@ -2,9 +2,15 @@ import sys
 import io
 import contextlib
 import traceback
+import importlib
+import threading
 import pandas as pd
 import numpy as np
 
+# 生成代码常用的重型库，预热时提前导入
+WARMUP_MODULES = ("sklearn", "scipy", "joblib", "matplotlib")
+
+
 class PythonREPL:
     """
     持久化的 Python 交互式解释器 (Sandbox)。
@@ -42,6 +48,26 @@ class PythonREPL:
             error_msg = traceback.format_exc()
             return f"{io_buffer.getvalue()}\n❌ 运行时错误:\n{error_msg}"
 
+    @staticmethod
+    def warmup(modules=WARMUP_MODULES) -> threading.Thread:
+        """
+        在后台线程中预先导入重型库
+        
+        REPL 与生成的代码运行在同一进程，导入结果会缓存在 sys.modules 中，
+        因此预热后首个任务无需再承担 sklearn/scipy 等库的冷启动开销。
+        未安装的库会被静默跳过。
+        """
+        def _import_all():
+            for name in modules:
+                try:
+                    importlib.import_module(name)
+                except Exception:
+                    pass
+        
+        thread = threading.Thread(target=_import_all, name="repl-warmup", daemon=True)
+        thread.start()
+        return thread
+
     def get_var(self, name: str):
         """(调试用) 获取当前沙箱中的变量值"""
         return self.locals.get(name) or self.globals.get(name)
@@ -2,5 +2,6 @@
 from src.utils.llm_client import get_llm_client
 from src.utils.neo4j_connector import Neo4jConnector
 from src.utils.logger import setup_logger
+from src.utils.json_utils import dump_json
 
-__all__ = ['get_llm_client', 'Neo4jConnector', 'setup_logger']
+__all__ = ['get_llm_client', 'Neo4jConnector', 'setup_logger', 'dump_json']
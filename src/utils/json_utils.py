@@ -0,0 +1,45 @@
+"""
+JSON 工具
+统一的 JSON 文件写入（优先使用 orjson 加速）
+"""
+
+import json
+from pathlib import Path
+from typing import Any, Union
+
+try:
+    import orjson
+except ImportError:  # orjson 为可选依赖，缺失时回退到标准库
+    orjson = None
+
+
+def dump_json(obj: Any, path: Union[str, Path]) -> Path:
+    """
+    将对象写入 UTF-8 JSON 文件（缩进 2，保留中文）
+
+    安装了 orjson 时一次性编码为 bytes 再写入，速度比标准库快数倍；
+    否则回退到 json.dump，输出格式保持一致。
+
+    Args:
+        obj: 要保存的对象
+        path: 目标文件路径
+
+    Returns:
+        写入的文件路径
+    """
+    path = Path(path)
+
+    if orjson is not None:
+        try:
+            path.write_bytes(orjson.dumps(
+                obj,
+                option=orjson.OPT_INDENT_2 | orjson.OPT_NON_STR_KEYS | orjson.OPT_SERIALIZE_NUMPY
+            ))
+            return path
+        except TypeError:
+            # orjson 不支持的类型（如自定义对象），交给标准库处理
+            pass
+
+    with open(path, 'w', encoding='utf-8') as f:
+        json.dump(obj, f, ensure_ascii=False, indent=2)
+    return path
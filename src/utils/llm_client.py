@@ -5,6 +5,8 @@ LLM 客户端封装
 
 import os
 import time
+from functools import lru_cache
+from pathlib import Path
 from typing import Optional, Dict, Any
 from langchain_openai import ChatOpenAI
 from dotenv import load_dotenv
@@ -13,6 +15,26 @@ from openai import APIConnectionError, APITimeoutError, RateLimitError
 load_dotenv()
 
 
+def _configure_llm_cache():
+    """
+    按需启用 LangChain 全局响应缓存
+    
+    设置环境变量 LLM_CACHE_PATH（如 .cache/llm_cache.db）后，相同提示词 + 相同模型参数
+    的调用直接从本地 SQLite 返回，不再请求 LLM。默认关闭，以保留方案多样性。
+    """
+    cache_path = os.getenv("LLM_CACHE_PATH")
+    if not cache_path:
+        return
+    
+    from langchain_core.globals import get_llm_cache, set_llm_cache
+    if get_llm_cache() is not None:
+        return
+    
+    from langchain_community.cache import SQLiteCache
+    Path(cache_path).parent.mkdir(parents=True, exist_ok=True)
+    set_llm_cache(SQLiteCache(database_path=cache_path))
+
+
 class LLMClient:
     """
     LLM 客户端封装类
@@ -46,6 +68,8 @@ class LLMClient:
         # 获取 base URL
         self.base_url = base_url or "https://dashscope.aliyuncs.com/compatible-mode/v1"
         
+        _configure_llm_cache()
+        
         # 创建 LLM 实例（带重试配置）
         self.llm = ChatOpenAI(
             model=self.model,
@@ -143,10 +167,34 @@ class LLMClient:
         return cls(model=model, temperature=temperature)
 
 
+def get_shared_client(model: str = "qwen-max", temperature: float = 0.7) -> LLMClient:
+    """
+    获取进程内共享的 LLMClient（相同参数只创建一次，复用其 HTTP 连接池）
+    
+    Args:
+        model: 模型名称
+        temperature: 温度参数
+        
+    Returns:
+        LLMClient 实例
+    """
+    # 统一参数形式后再查缓存，使默认参数与显式传参命中同一实例
+    return _build_shared_client(model, float(temperature))
+
+
+@lru_cache(maxsize=None)
+def _build_shared_client(model: str, temperature: float) -> LLMClient:
+    """按 (model, temperature) 创建并缓存 LLMClient"""
+    return LLMClient(model=model, temperature=temperature)
+
+
 def get_llm_client(model: str = None, temperature: float = 0.3):
     """
     获取 LLM 客户端的便捷函数
     
+    相同的提供商 / 模型 / 温度返回同一个实例，多次调用共享 HTTP 连接池，
+    避免重复建立 TLS 连接。
+    
     Args:
         model: 模型名称（可选，默认从环境变量读取）
         temperature: 温度参数
@@ -155,10 +203,22 @@ def get_llm_client(model: str = None, temperature: float = 0.3):
         LLM 实例（ChatOpenAI 或 ChatTongyi）
     """
     provider = os.getenv("LLM_PROVIDER", "dashscope")
+    _configure_llm_cache()
     
+    # 先解析默认模型，使 model=None 与显式传入默认模型命中同一缓存实例
     if provider == "openai":
-        api_key = os.getenv("OPENAI_API_KEY")
         model = model or os.getenv("OPENAI_MODEL", "gpt-4")
+    elif provider == "dashscope":
+        model = model or os.getenv("DASHSCOPE_MODEL", "qwen3-max")
+    
+    return _build_llm_client(provider, model, float(temperature))
+
+
+@lru_cache(maxsize=None)
+def _build_llm_client(provider: str, model: str, temperature: float):
+    """按 (provider, model, temperature) 创建并缓存 ChatOpenAI 实例"""
+    if provider == "openai":
+        api_key = os.getenv("OPENAI_API_KEY")
         
         if not api_key:
             raise ValueError("请设置 OPENAI_API_KEY 环境变量")
@@ -171,7 +231,6 @@ def get_llm_client(model: str = None, temperature: float = 0.3):
     
     elif provider == "dashscope":
         api_key = os.getenv("DASHSCOPE_API_KEY")
-        model = model or os.getenv("DASHSCOPE_MODEL", "qwen3-max")
         base_url = "https://dashscope.aliyuncs.com/compatible-mode/v1"
         
         if not api_key:
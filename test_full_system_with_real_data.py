@@ -5,6 +5,8 @@
 
 import sys
 import os
+import io
+import contextlib
 import pandas as pd
 from pathlib import Path
 
@@ -23,9 +25,22 @@ from src.agents.coding_agent_v4_2 import CodingAgentV4_2  # 升级到 V4.2（终
 from src.agents.reviewer import ReviewerAgent
 from src.utils.llm_client import get_llm_client
 from src.utils.neo4j_connector import Neo4jConnector
+from src.utils.json_utils import dump_json
 from src.core.workflow import build_full_workflow
 
 
+@contextlib.contextmanager
+def _buffered_section():
+    """将一整段输出缓存在内存中，结束时一次性写入 stdout（避免逐行刷新）"""
+    buf = io.StringIO()
+    try:
+        with contextlib.redirect_stdout(buf):
+            yield buf
+    finally:
+        sys.stdout.write(buf.getvalue())
+        sys.stdout.flush()
+
+
 def load_test_data():
     """加载测试数据"""
     print("\n📊 加载测试数据...")
@@ -141,6 +156,7 @@ def test_full_workflow():
         return False
 
 
+@_buffered_section()
 def display_results(result):
     """显示执行结果"""
     
@@ -234,6 +250,7 @@ def display_results(result):
     print(f"\n回写状态: {result.get('writeback_status', 'N/A')}")
 
 
+@_buffered_section()
 def save_results(result):
     """保存结果到文件"""
     
@@ -244,8 +261,6 @@ def save_results(result):
     print("💾 保存结果")
     print("-"*80)
     
-    import json
-    
     def clean_for_json(obj):
         """清理对象使其可以 JSON 序列化"""
         import pandas as pd
@@ -286,36 +301,31 @@ def save_results(result):
     
     # 保存蓝图
     blueprint_file = output_dir / "blueprint.json"
-    with open(blueprint_file, 'w', encoding='utf-8') as f:
-        json.dump(clean_for_json(result['blueprint']), f, ensure_ascii=False, indent=2)
+    dump_json(clean_for_json(result['blueprint']), blueprint_file)
     print(f"✅ {blueprint_file}")
     
     # 保存分析结果
     if 'analysis_results' in result and result['analysis_results']:
         results_file = output_dir / "analysis_results.json"
-        with open(results_file, 'w', encoding='utf-8') as f:
-            json.dump(clean_for_json(result['analysis_results']), f, ensure_ascii=False, indent=2)
+        dump_json(clean_for_json(result['analysis_results']), results_file)
         print(f"✅ {results_file}")
     
     # 保存执行规格
     specs_file = output_dir / "execution_specs.json"
-    with open(specs_file, 'w', encoding='utf-8') as f:
-        json.dump(clean_for_json(result['execution_specs']), f, ensure_ascii=False, indent=2)
+    dump_json(clean_for_json(result['execution_specs']), specs_file)
     print(f"✅ {specs_file}")
     
     # 注意：生成的代码已经在 workflow 中保存为 outputs/step_*.py，无需重复保存
     
     # 保存元数据
     metadata_file = output_dir / "code_metadata.json"
-    with open(metadata_file, 'w', encoding='utf-8') as f:
-        json.dump(clean_for_json(result['code_metadata']), f, ensure_ascii=False, indent=2)
+    dump_json(clean_for_json(result['code_metadata']), metadata_file)
     print(f"✅ {metadata_file}")
     
     # 保存验证结果
     if 'verification_result' in result:
         verification_file = output_dir / "verification_result.json"
-        with open(verification_file, 'w', encoding='utf-8') as f:
-            json.dump(clean_for_json(result['verification_result']), f, ensure_ascii=False, indent=2)
+        dump_json(clean_for_json(result['verification_result']), verification_file)
         print(f"✅ {verification_file}")
     
     # 保存最终报告
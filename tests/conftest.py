@@ -0,0 +1,37 @@
+"""
+pytest 共享配置
+支持使用 pytest-xdist 并行运行：python -m pytest -n auto --dist=loadfile tests/
+"""
+
+import sys
+from pathlib import Path
+
+import pytest
+
+# 测试脚本直接 import strategist_graph / neo4j_config，补齐对应目录
+PROJECT_ROOT = Path(__file__).resolve().parent.parent
+for path in (PROJECT_ROOT, PROJECT_ROOT / "core", PROJECT_ROOT / "config"):
+    if str(path) not in sys.path:
+        sys.path.insert(0, str(path))
+
+
+@pytest.fixture(scope="session")
+def neo4j_config():
+    """Neo4j 连接配置（整个测试会话只加载一次）"""
+    from neo4j_config import NEO4J_CONFIG
+    return NEO4J_CONFIG
+
+
+@pytest.fixture(scope="session")
+def uri(neo4j_config):
+    return neo4j_config["uri"]
+
+
+@pytest.fixture(scope="session")
+def user(neo4j_config):
+    return neo4j_config["user"]
+
+
+@pytest.fixture(scope="session")
+def password(neo4j_config):
+    return neo4j_config["password"]
@@ -8,7 +8,7 @@ sys.path.insert(0, str(Path(__file__).parent.parent))
 
 import pandas as pd
 from src.agents.coding_agent_v4 import CodingAgentV4
-from src.utils.llm_client import LLMClient
+from src.utils.llm_client import get_shared_client
 
 
 def test_v4_basic():
@@ -25,7 +25,7 @@ def test_v4_basic():
     })
     
     # 创建 agent
-    llm_client = LLMClient()
+    llm_client = get_shared_client()
     agent = CodingAgentV4(
         llm_client=llm_client,
         test_data=test_data,
@@ -71,7 +71,7 @@ def test_v4_security():
     
     test_data = pd.DataFrame({'col': [1, 2, 3]})
     
-    llm_client = LLMClient()
+    llm_client = get_shared_client()
     agent = CodingAgentV4(
         llm_client=llm_client,
         test_data=test_data,
@@ -103,7 +103,7 @@ def test_v4_concurrent():
     test_data_1 = pd.DataFrame({'col_a': [1, 2, 3]})
     test_data_2 = pd.DataFrame({'col_b': [4, 5, 6]})
     
-    llm_client = LLMClient()
+    llm_client = get_shared_client()
     agent = CodingAgentV4(llm_client=llm_client, max_iterations=1)
     
     # 模拟并发调用（实际上是顺序，但验证状态隔离）
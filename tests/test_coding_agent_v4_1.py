@@ -8,7 +8,7 @@ sys.path.insert(0, str(Path(__file__).parent.parent))
 
 import pandas as pd
 from src.agents.coding_agent_v4_1 import CodingAgentV4_1
-from src.utils.llm_client import LLMClient
+from src.utils.llm_client import get_shared_client
 
 
 def test_enhanced_code_extraction():
@@ -17,7 +17,7 @@ def test_enhanced_code_extraction():
     print("测试 1: 增强的代码提取")
     print("=" * 80)
     
-    llm_client = LLMClient()
+    llm_client = get_shared_client()
     agent = CodingAgentV4_1(llm_client=llm_client, max_iterations=2)
     
     # 测试不同格式的代码
@@ -87,7 +87,7 @@ def test_error_parsing():
     print("测试 2: 错误解析")
     print("=" * 80)
     
-    llm_client = LLMClient()
+    llm_client = get_shared_client()
     agent = CodingAgentV4_1(llm_client=llm_client, max_iterations=2)
     
     # 测试不同类型的错误
@@ -116,7 +116,7 @@ def test_repeated_error_detection():
     print("测试 3: 重复错误检测")
     print("=" * 80)
     
-    llm_client = LLMClient()
+    llm_client = get_shared_client()
     agent = CodingAgentV4_1(llm_client=llm_client, max_iterations=2)
     
     # 模拟错误历史
@@ -152,7 +152,7 @@ def test_v4_1_with_real_data():
     })
     
     # 创建 agent
-    llm_client = LLMClient()
+    llm_client = get_shared_client()
     agent = CodingAgentV4_1(
         llm_client=llm_client,
         test_data=test_data,
@@ -34,8 +34,8 @@ def test_full_chain_retrieval():
             print(f"    方法: {step.get('method', 'N/A')}")
             
             if step.get('config'):
-                config_str = str(step.get('config'))[:100]
-                print(f"    配置: {config_str}...")
+                config_str = str(step.get('config'))
+                print(f"    配置: {config_str[:100]}{'...' if len(config_str) > 100 else ''}")
             
             if step.get('metrics'):
                 print(f"    指标: {step.get('metrics')}")
@@ -0,0 +1,200 @@
+"""
+测试 Methodologist 的多步骤调度
+重点测试：按 depends_on 分波次执行、输出顺序、前置输出规格的传递
+"""
+
+import sys
+from pathlib import Path
+sys.path.insert(0, str(Path(__file__).parent.parent))
+
+import json
+import re
+import threading
+from unittest.mock import Mock
+from src.agents.methodologist import MethodologistAgent
+
+
+def _make_mock_llm():
+    """
+    构造 Mock LLM：按提示词中的 step_id 返回执行规格
+
+    每个步骤的 output_specification 带有唯一标记 out-<step_id>，
+    通过检查提示词中出现的标记即可知道该步骤收到了哪个前置输出。
+
+    Returns:
+        (mock_llm, received)，received 记录 step_id -> 提示词中出现的前置标记
+    """
+    received = {}
+
+    def invoke(prompt, **kwargs):
+        response = Mock()
+        match = re.search(r"输出 JSON 中的 step_id 必须为 (\d+)", prompt)
+        if match is None:
+            # 前缀预热请求
+            response.content = "{}"
+            return response
+
+        step_id = int(match.group(1))
+        received[step_id] = re.findall(r"out-(\d+)", prompt)
+        response.content = json.dumps({
+            "step_id": step_id,
+            "function_name": f"step_{step_id}",
+            "required_libraries": ["pandas"],
+            "processing_steps": [{"step_number": 1, "description": "处理"}],
+            "output_specification": {"marker": f"out-{step_id}"}
+        })
+        return response
+
+    mock_llm = Mock()
+    mock_llm.invoke.side_effect = invoke
+    return mock_llm, received
+
+
+def test_output_order_preserved():
+    """测试输出顺序与输入步骤一致"""
+    mock_llm, _ = _make_mock_llm()
+    methodologist = MethodologistAgent(mock_llm)
+
+    steps = [
+        {"step_id": 1, "objective": "A", "depends_on": []},
+        {"step_id": 2, "objective": "B", "depends_on": [1]},
+        {"step_id": 3, "objective": "C", "depends_on": []},
+        {"step_id": 4, "objective": "D", "depends_on": [2, 3]}
+    ]
+    specs = methodologist.process_multiple(steps)
+
+    assert [spec["step_id"] for spec in specs] == [1, 2, 3, 4], "输出顺序应与输入一致"
+    print("✅ 输出顺序保持一致")
+
+
+def test_dependency_receives_output_specification():
+    """测试 depends_on: [1] 的步骤收到步骤 1 的输出规格，独立步骤收到 None"""
+    mock_llm, received = _make_mock_llm()
+    methodologist = MethodologistAgent(mock_llm)
+
+    steps = [
+        {"step_id": 1, "objective": "A", "depends_on": []},
+        {"step_id": 2, "objective": "B", "depends_on": []},
+        {"step_id": 3, "objective": "C", "depends_on": [1]}
+    ]
+    methodologist.process_multiple(steps)
+
+    assert received[3] == ["1"], "步骤 3 应收到步骤 1 的输出规格"
+    assert received[1] == [], "独立步骤不应收到前置输出"
+    assert received[2] == [], "独立步骤不应收到前置输出"
+    print("✅ 依赖步骤收到正确的前置输出规格")
+
+
+def test_missing_depends_on_chains_to_previous():
+    """测试未声明 depends_on 的步骤依赖前一步"""
+    mock_llm, received = _make_mock_llm()
+    methodologist = MethodologistAgent(mock_llm)
+
+    steps = [
+        {"step_id": 1, "objective": "A"},
+        {"step_id": 2, "objective": "B"},
+        {"step_id": 3, "objective": "C"}
+    ]
+    methodologist.process_multiple(steps)
+
+    assert received[1] == []
+    assert received[2] == ["1"], "步骤 2 应串行依赖步骤 1"
+    assert received[3] == ["2"], "步骤 3 应串行依赖步骤 2"
+    print("✅ 未声明 depends_on 时沿用串行语义")
+
+
+def test_scalar_depends_on():
+    """测试 depends_on 为单个值（整数或字符串）时按单元素列表处理"""
+    mock_llm, received = _make_mock_llm()
+    methodologist = MethodologistAgent(mock_llm)
+
+    steps = [
+        {"step_id": 1, "objective": "A", "depends_on": []},
+        {"step_id": 2, "objective": "B", "depends_on": []},
+        {"step_id": 12, "objective": "C", "depends_on": 1},
+        {"step_id": 4, "objective": "D", "depends_on": "12"}
+    ]
+    specs = methodologist.process_multiple(steps)
+
+    assert [spec["step_id"] for spec in specs] == [1, 2, 12, 4]
+    assert received[12] == ["1"], "depends_on: 1 应依赖步骤 1"
+    assert received[4] == ["12"], "depends_on: \"12\" 应依赖步骤 12，而不是步骤 1 和 2"
+    print("✅ 单值 depends_on 解析正确")
+
+
+def test_warmup_only_before_first_request():
+    """测试前缀预热：已有请求发送过前缀时不再额外预热"""
+    mock_llm, _ = _make_mock_llm()
+    methodologist = MethodologistAgent(mock_llm)
+
+    # 常见形态：步骤 1 单独执行，步骤 2、3 依赖步骤 1 并发执行
+    steps = [
+        {"step_id": 1, "objective": "A", "depends_on": []},
+        {"step_id": 2, "objective": "B", "depends_on": [1]},
+        {"step_id": 3, "objective": "C", "depends_on": [1]}
+    ]
+    methodologist.process_multiple(steps)
+    assert mock_llm.invoke.call_count == 3, "步骤 1 已发送前缀，第二波次前不应再预热"
+
+    # 第一波次即并发时，先预热一次
+    mock_llm, _ = _make_mock_llm()
+    methodologist = MethodologistAgent(mock_llm)
+    steps = [
+        {"step_id": 1, "objective": "A", "depends_on": []},
+        {"step_id": 2, "objective": "B", "depends_on": []},
+        {"step_id": 3, "objective": "C", "depends_on": [1, 2]}
+    ]
+    methodologist.process_multiple(steps)
+    assert mock_llm.invoke.call_count == 4, "并发的第一波次前应预热一次"
+    assert mock_llm.invoke.call_args_list[0].kwargs.get("max_tokens") == 1
+    print("✅ 前缀预热只在必要时执行")
+
+
+def test_cycle_falls_back_to_order():
+    """测试循环依赖退化为按顺序处理，不会卡死"""
+    mock_llm, received = _make_mock_llm()
+    methodologist = MethodologistAgent(mock_llm)
+
+    steps = [
+        {"step_id": 1, "objective": "A", "depends_on": [2]},
+        {"step_id": 2, "objective": "B", "depends_on": [1]}
+    ]
+
+    # 在守护线程中运行，超时后不会阻塞测试进程退出
+    result = {}
+    worker = threading.Thread(
+        target=lambda: result.update(specs=methodologist.process_multiple(steps)),
+        daemon=True
+    )
+    worker.start()
+    worker.join(timeout=10)
+    assert not worker.is_alive(), "循环依赖导致调度卡死"
+
+    specs = result["specs"]
+    assert [spec["step_id"] for spec in specs] == [1, 2]
+    assert received[1] == [], "循环中的第一个步骤没有可用的前置输出"
+    assert received[2] == ["1"], "第二个步骤应收到步骤 1 的输出规格"
+    print("✅ 循环依赖按顺序处理")
+
+
+if __name__ == "__main__":
+    print("=" * 60)
+    print("测试 Methodologist 多步骤调度")
+    print("=" * 60)
+
+    test_output_order_preserved()
+    print()
+
+    test_dependency_receives_output_specification()
+    print()
+
+    test_missing_depends_on_chains_to_previous()
+    print()
+
+    test_scalar_depends_on()
+    print()
+
+    test_warmup_only_before_first_request()
+    print()
+
+    test_cycle_falls_back_to_order()
@@ -5,14 +5,17 @@
 from neo4j import GraphDatabase
 
 
-def test_connection(uri: str, user: str, password: str):
+def check_connection(uri: str, user: str, password: str) -> bool:
     """
-    测试 Neo4j 连接是否正常
+    检查 Neo4j 连接是否正常
     
     Args:
         uri: Neo4j 数据库地址
         user: 用户名
         password: 密码
+        
+    Returns:
+        连接成功返回 True，否则打印排查提示并返回 False
     """
     print("正在测试 Neo4j 连接...")
     print(f"URI: {uri}")
@@ -22,15 +25,17 @@ def test_connection(uri: str, user: str, password: str):
         # 尝试连接
         driver = GraphDatabase.driver(uri, auth=(user, password))
         
-        # 执行简单查询
+        # 连通性检查与数据库信息合并为一次查询（减少一次往返）
         with driver.session() as session:
-            result = session.run("RETURN 'Connection successful!' AS message")
-            record = result.single()
-            print(f"\n✓ {record['message']}")
+            result = session.run(
+                "CALL dbms.components() YIELD name, versions, edition "
+                "RETURN 'Connection successful!' AS message, edition, versions"
+            )
+            records = list(result)
+            print(f"\n✓ {records[0]['message'] if records else 'Connection successful!'}")
             
             # 获取数据库信息
-            result = session.run("CALL dbms.components() YIELD name, versions, edition")
-            for record in result:
+            for record in records:
                 print(f"  Neo4j {record['edition']}: {record['versions'][0]}")
         
         driver.close()
@@ -47,6 +52,11 @@ def test_connection(uri: str, user: str, password: str):
         return False
 
 
+def test_connection(uri: str, user: str, password: str):
+    """测试 Neo4j 连接是否正常（参数由 conftest.py 中的 fixture 提供）"""
+    assert check_connection(uri, user, password), "Neo4j 连接失败"
+
+
 def main():
     """主函数"""
     
@@ -62,7 +72,7 @@ def main():
         user = "neo4j"
         password = input("请输入 Neo4j 密码: ")
     
-    test_connection(uri, user, password)
+    check_connection(uri, user, password)
 
 
 if __name__ == "__main__":
@@ -3,6 +3,7 @@
 """
 
 import json
+from concurrent.futures import ThreadPoolExecutor
 from strategist_graph import build_graph, initialize_graph_tool, graph_tool
 
 
@@ -51,17 +52,25 @@ def test_multiple_goals():
     ]
     
     app = build_graph()
-    results = []
     
-    for i, goal in enumerate(goals, 1):
-        print(f"\n  [{i}/{len(goals)}] 测试目标: {goal}")
-        
-        result = app.invoke({
+    # 并发前先初始化全局 GraphTool，避免多个线程各自创建 Neo4j 驱动
+    initialize_graph_tool()
+    
+    def run_goal(goal):
+        return app.invoke({
             "user_goal": goal,
             "graph_context": "",
             "generated_idea": {},
             "critique": ""
         })
+    
+    # 各目标相互独立，并发执行（总耗时 ≈ 最慢的一个）
+    with ThreadPoolExecutor(max_workers=len(goals)) as executor:
+        outputs = list(executor.map(run_goal, goals))
+    
+    results = []
+    for i, (goal, result) in enumerate(zip(goals, outputs), 1):
+        print(f"\n  [{i}/{len(goals)}] 测试目标: {goal}")
         
         results.append({
             "goal": goal,
@@ -8,15 +8,10 @@
 
 # ... (前面的代码保持不变，只修改 analyze_patent_with_qwen 函数中的 prompt)
 
-def analyze_patent_with_qwen_v2(text):
-    """
-    使用Qwen模型分析专利文本 - V2.0 增强版
-    ✨ 新增 Dataset 节点提取
-    """
-    # ... (前面的代码保持不变)
-    
-    # 构造优化后的 prompt
-    prompt = f"""
+from typing import Final
+
+# 静态提示词（角色、本体、示例），只在模块加载时构造一次
+_PROMPT_PREFIX: Final[str] = """
 # Role (角色)
 你是一位专精于"文献计量学"、"专利数据挖掘"及"机器学习"领域的**首席算法架构师**。
 
@@ -149,14 +144,14 @@ def analyze_patent_with_qwen_v2(text):
 
 # Output Format (输出格式) ✨ 新增 datasets 字段
 
-{{
-  "paper_meta": {{
+{
+  "paper_meta": {
     "title": "...", 
     "year": "..."
-  }},
+  },
   
   "datasets": [
-    {{
+    {
       "dataset_id": "D1",
       "name": "数据集的简短名称（如 'USPTO Patents 2010-2020'）",
       "source": "数据来源（从本体选，如 'USPTO'）",
@@ -165,11 +160,11 @@ def analyze_patent_with_qwen_v2(text):
       "time_range": "时间范围（如 '2010-2020'）",
       "preprocessing": "预处理步骤（如 '去重、清洗、过滤非英文'）",
       "notes": "其他说明"
-    }}
+    }
   ],
   
   "analysis_logic_chains": [
-    {{
+    {
       "step_id": 1,
       "objective": "该步骤的具体分析目的",
       
@@ -177,28 +172,28 @@ def analyze_patent_with_qwen_v2(text):
       
       "method_name": "标准算法名 (从本体选)",
       
-      "implementation_config": {{
+      "implementation_config": {
           "library": "使用的工具或库。若未提及填 null。",
-          "parameters": {{
+          "parameters": {
               "key": "value"
-          }},
+          },
           "notes": "其他实施细节描述。"
-      }},
+      },
       
       "data_fields_used": ["使用了哪些数据字段 (从本体选)"],
       
       "evaluation_metrics": [
-          {{
+          {
               "metric_name": "指标名称",
               "metric_value": "具体的数值结果",
               "significance": "该数值说明了什么？"
-          }}
+          }
       ],
       
       "derived_conclusion": "该步骤最终导出的定性结论。"
-    }}
+    }
   ]
-}}
+}
 
 # Examples (示例 - Few-Shot)
 
@@ -207,14 +202,14 @@ def analyze_patent_with_qwen_v2(text):
 "We retrieved 5,000 solid-state battery patents from USPTO (2010-2020) using the keyword 'solid-state battery' and IPC code H01M. After removing duplicates and non-English patents, we applied LDA (K=50) to identify technology topics. The coherence score was 0.58."
 
 ### Output JSON:
-{{
-  "paper_meta": {{
+{
+  "paper_meta": {
     "title": "Solid-State Battery Technology Analysis",
     "year": "2023"
-  }},
+  },
   
   "datasets": [
-    {{
+    {
       "dataset_id": "D1",
       "name": "USPTO Solid-State Battery Patents 2010-2020",
       "source": "USPTO (美国专利商标局)",
@@ -223,39 +218,52 @@ def analyze_patent_with_qwen_v2(text):
       "time_range": "2010-2020",
       "preprocessing": "去重、过滤非英文专利",
       "notes": "初始检索结果可能更多，经过清洗后得到5000件"
-    }}
+    }
   ],
   
   "analysis_logic_chains": [
-    {{
+    {
       "step_id": 1,
       "objective": "识别固态电池技术主题",
       "dataset_used": "D1",
       "method_name": "LDA (主题模型)",
-      "implementation_config": {{
+      "implementation_config": {
           "library": "Gensim (推测)",
-          "parameters": {{
+          "parameters": {
               "num_topics": 50
-          }},
+          },
           "notes": "未明确说明库，但LDA常用Gensim实现"
-      }},
+      },
       "data_fields_used": ["摘要 (Abstract)", "权利要求 (Claims)"],
       "evaluation_metrics": [
-          {{
+          {
               "metric_name": "Coherence Score",
               "metric_value": "0.58",
               "significance": "主题划分具有较高的语义连贯性"
-          }}
+          }
       ],
       "derived_conclusion": "成功识别出50个核心技术主题"
-    }}
+    }
   ]
-}}
+}
 
 # Input Data (待分析摘要)
-{text}
+"""
+
+_PROMPT_SUFFIX: Final[str] = """
 
 请严格按照以上JSON格式输出，不要包含任何其他内容。
     """
+
+
+def analyze_patent_with_qwen_v2(text):
+    """
+    使用Qwen模型分析专利文本 - V2.0 增强版
+    ✨ 新增 Dataset 节点提取
+    """
+    # ... (前面的代码保持不变)
+    
+    # 构造 prompt：静态部分为模块级常量，只拼接待分析文本
+    prompt = _PROMPT_PREFIX + text + _PROMPT_SUFFIX
     
     # ... (后续代码保持不变)